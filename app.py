@@ -1,16 +1,26 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import google.generativeai as genai
 import yfinance as yf
+import yfinance_cache as yfc
 import feedparser
+import aiohttp
+import asyncio
 import datetime
+import numpy as np
+import json
 import re
 import os
+import threading
 from PIL import Image
 import io
+from concurrent.futures import ThreadPoolExecutor
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
-import tempfile
+import hashlib
+from typing import TypedDict
+from cache import cached
 
 # Configure Gemini API
 try:
@@ -22,121 +32,289 @@ except Exception as e:
         f"Failed to configure Gemini API: {e}. Please set GEMINI_API_KEY in your Cloud Run environment variables.")
     st.stop()
 
+# Verbose yfinance logging for troubleshooting Yahoo Finance requests
+if os.getenv("YFINANCE_DEBUG"):
+    yf.enable_debug_mode()
+
+
+@st.cache_resource(show_spinner=False)
+def get_model():
+    """Return the Gemini 2.5 Pro model, built once per server process and shared across reruns."""
+    return genai.GenerativeModel("gemini-2.5-pro")
+
+
+# Cache lifetimes (seconds) for market data and Gemini outputs. Where st.cache_data sits on top of
+# the file cache, a disk hit is re-cached in process, so the two layers split one freshness budget.
+STOCK_DATA_TTL = 900
+STOCK_DATA_SESSION_TTL = 300
+GEMINI_TTL = 3600
+GEMINI_SESSION_TTL = 600
+
+# Connection settings for news feed requests
+RSS_CONNECTION_LIMIT = 10
+RSS_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+# News feeds queried for headlines, and the number of unique headlines kept
+RSS_SOURCES = [
+    "https://news.google.com/rss/search?q={ticker}+stock",
+    "https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}&region=US&lang=en-US",
+    "https://www.bing.com/news/search?q={ticker}+stock&format=rss",
+]
+MAX_HEADLINES = 30
+
+# Ticker extraction: common uppercase words are only validated when no other candidate matches
+_TICKER_RE = re.compile(r"\b[A-Z]{1,5}\b")
+_NON_TICKER_WORDS = frozenset({
+    "A", "I", "AM", "AN", "AND", "ARE", "AS", "AT", "BE", "BUT", "BY", "CAN", "DO", "DOES", "FOR", "FROM",
+    "HAS", "HOW", "IF", "IN", "IS", "IT", "ITS", "ME", "MY", "NEWS", "NO", "NOT", "NOW", "OF", "ON", "OR",
+    "OUR", "SO", "THE", "TO", "UP", "US", "VS", "WAS", "WHAT", "WHEN", "WHY", "WITH", "YOU",
+    "AI", "CEO", "CFO", "EPS", "ETF", "IPO", "PE", "USA", "USD",
+})
+
+# Upper bound on concurrent Yahoo lookups while validating ticker candidates
+MAX_VALIDATION_WORKERS = 8
+
+# Gemini prompt templates
+_STOCK_ANALYSIS_TEMPLATE = """You are a financial analyst AI.
+Analyze the stock performance of {ticker} over the past week based on:
+{trend_data}
+Recent headlines:
+{headlines}
+
+Task 1 (sentiment, sentiment_explanation): Provide a sentiment summary of the headlines (Bullish, Slightly Bullish, Neutral, Slightly Bearish, Bearish) and a brief explanation (1-2 sentences).
+
+Task 2 (trend_analysis): Provide in short:
+1. Full name of stock and main highlight
+2. Overall trend (rising, falling, flat)
+3. Connection with relevant news
+4. Investor insight (1-2 sentences)
+
+Do NOT make up news or events. Only use what’s above. Avoid repetitions and any extra or filler words.
+"""
+
+_IMAGE_TEMPLATE = (
+    "Analyze this financial chart or screenshot for {ticker}. Identify key patterns such as moving averages, "
+    "trends, or indicators (e.g., 50-day vs. 200-day moving average, RSI, MACD). Provide a concise insight, "
+    "such as whether the chart indicates a bullish or bearish trend."
+)
+
+# Longest edge (pixels) of charts sent to Gemini
+MAX_IMAGE_EDGE = 1024
+
+
+@st.cache_resource(show_spinner=False)
+def get_report_styles():
+    """Return ReportLab's sample stylesheet, built once per server process and shared across reruns."""
+    return getSampleStyleSheet()
+
+
+def _attach_script_run_ctx(ctx):
+    """Executor initializer giving worker threads the session's ScriptRunContext for st.cache_* calls."""
+    add_script_run_ctx(threading.current_thread(), ctx)
+
+
+def _is_result(text):
+    """Only cache Gemini outputs that are not error messages."""
+    return not text.startswith("Error")
+
 
 # Helper Functions
-def analyze_image(image_data, prompt):
-    """Analyze an uploaded financial chart or screenshot using Gemini 2.5 Pro."""
+def prepare_image(image):
+    """Downscale an uploaded chart and re-encode it as JPEG to keep Gemini uploads small."""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        # Flatten transparency onto white so dark chart text stays readable after dropping alpha
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    else:
+        image = image.convert("RGB")
+    image.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.LANCZOS)
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", quality=85, optimize=True)
+    return {"mime_type": "image/jpeg", "data": buf.getvalue()}
+
+
+@cached(ttl=GEMINI_TTL, cache_if=_is_result,
+        key=lambda image_data, prompt, on_text=None: [hashlib.md5(image_data["data"]).hexdigest(), prompt])
+def analyze_image(image_data, prompt, on_text=None):
+    """Analyze an uploaded financial chart or screenshot using Gemini 2.5 Pro.
+
+    The response is streamed; on_text, if given, receives the accumulated text after each chunk.
+    """
     try:
-        model = genai.GenerativeModel("gemini-2.5-pro")
-        response = model.generate_content([prompt, image_data])
-        return response.text
+        response = get_model().generate_content([prompt, image_data], stream=True)
+        text = ""
+        for chunk in response:
+            text += chunk.text
+            if on_text:
+                on_text(text)
+        return text
     except Exception as e:
         return f"Error analyzing image: {str(e)}"
 
 
+def validate_ticker(symbol):
+    """Check whether a symbol resolves to a quoted ticker on Yahoo Finance."""
+    try:
+        return yf.Ticker(symbol).fast_info.last_price is not None, None
+    except KeyError:
+        return False, None
+    except Exception as e:
+        return False, e
+
+
+async def fetch_history_async(ticker):
+    """Fetch the past week of daily prices without blocking the event loop."""
+    ticker_obj = yfc.Ticker(ticker)
+    return await asyncio.to_thread(ticker_obj.history, period="5d", interval="1d")
+
+
+async def fetch_feed_async(session, url):
+    """Download a news feed; parsing is left to feedparser so it never touches the network."""
+    async with session.get(url) as resp:
+        resp.raise_for_status()
+        return await resp.read()
+
+
+async def fetch_stock_data_async(ticker):
+    """Fetch price history and news headlines for the given ticker concurrently."""
+    rss_urls = [template.format(ticker=ticker) for template in RSS_SOURCES]
+    connector = aiohttp.TCPConnector(limit=RSS_CONNECTION_LIMIT)
+    async with aiohttp.ClientSession(connector=connector, timeout=RSS_TIMEOUT) as session:
+        data, *rss_bodies = await asyncio.gather(
+            fetch_history_async(ticker),
+            *(fetch_feed_async(session, url) for url in rss_urls),
+            return_exceptions=True)
+    if isinstance(data, Exception):
+        raise data
+    data = data["Close"].dropna().round(2)
+
+    if len(data) < 2:
+        raise ValueError(f"Not enough data for {ticker}.")
+
+    closes = data.to_numpy()
+    price, prev, first = closes[-1], closes[-2], closes[0]
+    change = (price - prev) / prev * 100
+    week_change = (price - first) / first * 100
+    dates = data.index.strftime('%Y-%m-%d').to_numpy(dtype=str)
+    trend_data = "\n".join(np.char.add(np.char.add(dates, ": $"), closes.astype(str)))
+
+    # Parse news from the downloaded feeds, skipping any source that failed
+    feeds = [body for body in rss_bodies if not isinstance(body, Exception)]
+    titles = [entry.title for body in feeds for entry in feedparser.parse(body).entries[:20]]
+    headlines = list(dict.fromkeys(titles))[:MAX_HEADLINES]
+
+    return {
+        "price": float(price),
+        "change": float(change),
+        "week_change": float(week_change),
+        "trend_data": trend_data,
+        "headlines": headlines
+    }
+
+
+@st.cache_data(ttl=STOCK_DATA_SESSION_TTL, show_spinner=False)
+@cached(ttl=STOCK_DATA_TTL - STOCK_DATA_SESSION_TTL, key=lambda ticker: [ticker, datetime.date.today().isoformat()])
+def _load_stock_data(ticker):
+    """Cached stock data lookup; failures raise so that neither cache stores them."""
+    return asyncio.run(fetch_stock_data_async(ticker))
+
+
 def fetch_stock_data(ticker):
     """Fetch stock data and news headlines for the given ticker."""
     try:
-        today = datetime.datetime.now().date()
-        seven_days_ago = today - datetime.timedelta(days=6)
-        ticker_obj = yf.Ticker(ticker)
-        data = ticker_obj.history(start=seven_days_ago, end=today + datetime.timedelta(days=1))
-        data = data["Close"].dropna().round(2)
-
-        if len(data) < 2:
-            return {"error": f"Not enough data for {ticker}."}
-
-        price = data.iloc[-1]
-        change = (data.iloc[-1] - data.iloc[-2]) / data.iloc[-2] * 100
-        week_change = (data.iloc[-1] - data.iloc[0]) / data.iloc[0] * 100
-        closing_prices = data.tolist()
-        dates = [seven_days_ago + datetime.timedelta(days=i) for i in range(7)]
-        trend_data = "\n".join([f"{d.strftime('%Y-%m-%d')}: ${p}" for d, p in zip(dates, closing_prices)])
-
-        # Fetch news
-        rss_url = f"https://news.google.com/rss/search?q={ticker}+stock"
-        feed = feedparser.parse(rss_url)
-        headlines = [entry.title for entry in feed.entries[:20]]
-
-        return {
-            "price": price,
-            "change": change,
-            "week_change": week_change,
-            "trend_data": trend_data,
-            "headlines": headlines
-        }
+        return _load_stock_data(ticker)
     except Exception as e:
         return {"error": str(e)}
 
 
-def analyze_sentiment(headlines):
-    """Analyze sentiment of news headlines using Gemini 2.5 Pro."""
+class StockAnalysis(TypedDict):
+    """Structured Gemini response combining news sentiment and trend analysis."""
+    sentiment: str
+    sentiment_explanation: str
+    trend_analysis: str
+
+
+@st.cache_data(ttl=GEMINI_SESSION_TTL, show_spinner=False)
+@cached(ttl=GEMINI_TTL - GEMINI_SESSION_TTL)
+def _run_stock_analysis(ticker, trend_data, headlines):
+    """Cached Gemini call behind analyze_stock; headlines is a tuple so Streamlit can hash it."""
+    headlines_block = "\n".join("- " + h for h in headlines)
+    prompt = _STOCK_ANALYSIS_TEMPLATE.format_map(
+        {"ticker": ticker, "trend_data": trend_data, "headlines": headlines_block})
+    response = get_model().generate_content(
+        prompt,
+        generation_config=genai.GenerationConfig(
+            response_mime_type="application/json", response_schema=StockAnalysis))
+    result = json.loads(response.text)
+    return {
+        "sentiment": f"{result['sentiment']}: {result['sentiment_explanation']}",
+        "trend_analysis": result["trend_analysis"],
+    }
+
+
+def analyze_stock(ticker, trend_data, headlines):
+    """Analyze news sentiment and the weekly price trend in a single Gemini 2.5 Pro call."""
     try:
-        model = genai.GenerativeModel("gemini-2.5-pro")
-        headlines_text = '\n'.join(f'- {h}' for h in headlines)
-        prompt = f"""
-        Analyze the sentiment of the following news headlines for a stock:
-        Headlines:
-        {headlines_text}
-
-        Provide a sentiment summary (Bullish, Slightly Bullish, Neutral, Slightly Bearish, Bearish) and a brief explanation (1-2 sentences).
-        """
-        response = model.generate_content(prompt)
-        return response.text
+        return _run_stock_analysis(ticker, trend_data, tuple(headlines))
     except Exception as e:
-        return f"Error analyzing sentiment: {str(e)}"
+        return {"error": f"Error analyzing stock: {str(e)}"}
 
 
 def generate_pdf_report(data):
     """Generate a PDF report summarizing stock analysis with dynamic text wrapping."""
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            doc = SimpleDocTemplate(tmp_file.name, pagesize=letter)
-            styles = getSampleStyleSheet()
-            style_normal = styles["Normal"]
-            style_heading = styles["Heading1"]
-            style_subheading = styles["Heading2"]
-
-            # Build PDF content
-            story = []
-
-            # Title
-            story.append(Paragraph(f"Stock Analysis Report: {data['ticker']}", style_heading))
+        buf = io.BytesIO()
+        doc = SimpleDocTemplate(buf, pagesize=letter)
+
+        # Build PDF content
+        story = []
+
+        # Title
+        story.append(Paragraph(f"Stock Analysis Report: {data['ticker']}", _H1))
+        story.append(Spacer(1, 12))
+
+        # Metadata
+        story.append(Paragraph(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d')}", _NORMAL))
+        story.append(Paragraph(f"Current Price: ${data['price']:.2f} ({data['change']:+.2f}% today)", _NORMAL))
+        story.append(Paragraph(
+            f"Weekly Change: {'gained' if data['week_change'] > 0 else 'lost'} {abs(data['week_change']):.2f}%",
+            _NORMAL))
+        story.append(Spacer(1, 12))
+
+        # Trend Analysis
+        story.append(Paragraph("Trend Analysis", _H2))
+        story.append(Paragraph(data["trend_analysis"].replace('\n', '<br/>'), _NORMAL))
+        story.append(Spacer(1, 12))
+
+        # Sentiment Analysis
+        story.append(Paragraph("Sentiment Analysis", _H2))
+        story.append(Paragraph(data["sentiment_analysis"].replace('\n', '<br/>'), _NORMAL))
+        story.append(Spacer(1, 12))
+
+        # Chart Analysis (if available)
+        if "image_analysis" in data and data["image_analysis"]:
+            story.append(Paragraph("Chart Analysis", _H2))
+            story.append(Paragraph(data["image_analysis"].replace('\n', '<br/>'), _NORMAL))
             story.append(Spacer(1, 12))
 
-            # Metadata
-            story.append(Paragraph(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d')}", style_normal))
-            story.append(Paragraph(f"Current Price: ${data['price']:.2f} ({data['change']:+.2f}% today)", style_normal))
-            story.append(Paragraph(
-                f"Weekly Change: {'gained' if data['week_change'] > 0 else 'lost'} {abs(data['week_change']):.2f}%",
-                style_normal))
-            story.append(Spacer(1, 12))
-
-            # Trend Analysis
-            story.append(Paragraph("Trend Analysis", style_subheading))
-            story.append(Paragraph(data["trend_analysis"].replace('\n', '<br/>'), style_normal))
-            story.append(Spacer(1, 12))
-
-            # Sentiment Analysis
-            story.append(Paragraph("Sentiment Analysis", style_subheading))
-            story.append(Paragraph(data["sentiment_analysis"].replace('\n', '<br/>'), style_normal))
-            story.append(Spacer(1, 12))
-
-            # Chart Analysis (if available)
-            if "image_analysis" in data and data["image_analysis"]:
-                story.append(Paragraph("Chart Analysis", style_subheading))
-                story.append(Paragraph(data["image_analysis"].replace('\n', '<br/>'), style_normal))
-                story.append(Spacer(1, 12))
-
-            # Build the PDF
-            doc.build(story)
-            return tmp_file.name
+        # Build the PDF
+        doc.build(story)
+        return buf.getvalue()
     except Exception as e:
         return f"Error generating report: {str(e)}"
 
 
 # Streamlit App
 st.set_page_config(page_title="SmartStock Analyst", layout="centered")
+
+# PDF report styles shared by every report; resolved after set_page_config, on the script thread
+_STYLES = get_report_styles()
+_NORMAL = _STYLES["Normal"]
+_H1 = _STYLES["Heading1"]
+_H2 = _STYLES["Heading2"]
+
 st.title("📈 SmartStock Analyst")
 st.caption("Analyze stocks with price trends, news, sentiment, chart analysis, and downloadable reports.")
 
@@ -149,16 +327,22 @@ if st.button("Analyze"):
     # Validate ticker input
     ticker_input = ""
     if question:
-        possible_tickers = re.findall(r"\b[A-Z]{1,5}\b", question)
-        for word in possible_tickers:
-            try:
-                ticker = yf.Ticker(word)
-                info = ticker.info
-                if info and 'symbol' in info:
+        possible_tickers = list(dict.fromkeys(_TICKER_RE.findall(question)))
+        candidate_groups = [
+            [word for word in possible_tickers if word not in _NON_TICKER_WORDS],
+            [word for word in possible_tickers if word in _NON_TICKER_WORDS],
+        ]
+        for candidates in candidate_groups:
+            if ticker_input or not candidates:
+                continue
+            with ThreadPoolExecutor(max_workers=min(len(candidates), MAX_VALIDATION_WORKERS)) as executor:
+                validated = list(executor.map(validate_ticker, candidates))
+            for word, (is_valid, error) in zip(candidates, validated):
+                if error:
+                    st.warning(f"Error validating ticker '{word}': {error}")
+                elif is_valid:
                     ticker_input = word
                     break
-            except Exception as e:
-                st.warning(f"Error validating ticker '{word}': {e}")
 
     if not ticker_input:
         st.warning("Please enter a valid stock symbol (e.g., AAPL, TSLA, or MSFT).")
@@ -172,89 +356,89 @@ if st.button("Analyze"):
             st.error(stock_data["error"])
             st.stop()
 
-        # Step 2: Perform sentiment analysis
-        sentiment_result = analyze_sentiment(stock_data["headlines"])
-        if "Error" in sentiment_result:
-            st.error(sentiment_result)
-            st.stop()
-
-        # Step 3: Perform image analysis if uploaded
-        image_analysis = ""
+        # Step 2: Prepare image prompt
+        image_data = None
+        image_prompt = ""
         if uploaded_file:
             try:
                 image = Image.open(uploaded_file)
                 st.image(image, caption="Uploaded Chart", use_container_width=True)
-                image_prompt = f"""
-                Analyze this financial chart or screenshot for {ticker_input}. Identify key patterns such as moving averages, trends, or indicators (e.g., 50-day vs. 200-day moving average, RSI, MACD). Provide a concise insight, such as whether the chart indicates a bullish or bearish trend.
-                """
-                image_analysis = analyze_image(image_data=image, prompt=image_prompt)
-                if "Error" in image_analysis:
-                    st.error(image_analysis)
-                    st.stop()
+                image_data = prepare_image(image)
+                image_prompt = _IMAGE_TEMPLATE.format(ticker=ticker_input)
             except Exception as e:
                 st.error(f"Error processing image: {e}")
                 st.stop()
 
-        # Step 4: Perform trend analysis
-        trend_prompt = f"""
-        You are a financial analyst AI.
-        Analyze the stock performance of {ticker_input} over the past week based on:
-        {stock_data['trend_data']}
-        Recent headlines:
-        {'-'.join(f'- {h}' for h in stock_data['headlines'])}
-        Provide in short:
-        1. Full name of stock and main highlight
-        2. Overall trend (rising, falling, flat)
-        3. Connection with relevant news
-        4. Investor insight (1-2 sentences)
-
-        Do NOT make up news or events. Only use what’s above. Avoid repetitions and any extra or filler words. 
-        """
+        # Step 3: Run sentiment/trend analysis in the background while the chart analysis streams
+        # Not a `with` block: its exit joins the worker, so an early st.stop() would wait on the Gemini call
+        executor = ThreadPoolExecutor(max_workers=1, initializer=_attach_script_run_ctx,
+                                      initargs=(get_script_run_ctx(),))
         try:
-            trend_analysis = genai.GenerativeModel("gemini-2.5-pro").generate_content(trend_prompt).text
-        except Exception as e:
-            st.error(f"Error in trend analysis: {e}")
-            st.stop()
+            stock_future = executor.submit(analyze_stock, ticker_input, stock_data["trend_data"],
+                                           stock_data["headlines"])
+
+            # Display results
+            st.subheader("🧾 Stock Summary")
+            st.write(f"📌  {ticker_input} current price: ${stock_data['price']:.2f} ({stock_data['change']:+.2f}% today)."
+                     f" Over the past week, the stock has {'gained' if stock_data['week_change'] > 0 else 'lost'} {abs(stock_data['week_change']):.2f}%")
+
+            trend_section = st.empty()
+            sentiment_section = st.empty()
+
+            image_analysis = ""
+            if image_data is not None:
+                st.markdown("<h3 style='font-size: 24px;'>📊 Chart Analysis:</h3>", unsafe_allow_html=True)
+                image_placeholder = st.empty()
+                image_analysis = analyze_image(image_data, image_prompt, on_text=image_placeholder.markdown)
+                if "Error" in image_analysis:
+                    image_placeholder.empty()
+                    st.error(image_analysis)
+                    st.stop()
+                image_placeholder.markdown(image_analysis)
 
-        # Step 5: Generate report
-        report_data = {
-            "ticker": ticker_input,
-            "price": stock_data["price"],
-            "change": stock_data["change"],
-            "week_change": stock_data["week_change"],
-            "trend_analysis": trend_analysis,
-            "sentiment_analysis": sentiment_result,
-            "image_analysis": image_analysis if uploaded_file else ""
-        }
-        report_file = generate_pdf_report(report_data)
-        if "Error" in report_file:
-            st.error(report_file)
+            # Step 4: Check sentiment/trend analysis
+            stock_analysis = stock_future.result()
+            if "error" in stock_analysis:
+                st.error(stock_analysis["error"])
+                st.stop()
+            sentiment_result = stock_analysis["sentiment"]
+            trend_analysis = stock_analysis["trend_analysis"]
+
+            # Step 5: Generate report in the background while the analysis is rendered
+            report_data = {
+                "ticker": ticker_input,
+                "price": stock_data["price"],
+                "change": stock_data["change"],
+                "week_change": stock_data["week_change"],
+                "trend_analysis": trend_analysis,
+                "sentiment_analysis": sentiment_result,
+                "image_analysis": image_analysis if uploaded_file else ""
+            }
+            pdf_future = executor.submit(generate_pdf_report, report_data)
+
+            with trend_section.container():
+                st.markdown("<h3 style='font-size: 24px;'>📈 Trend Analysis</h3>", unsafe_allow_html=True)
+                st.write(trend_analysis)
+
+            with sentiment_section.container():
+                st.markdown("<h3 style='font-size: 24px;'>😊 Sentiment Analysis</h3>", unsafe_allow_html=True)
+                st.write(sentiment_result)
+
+            pdf_bytes = pdf_future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if isinstance(pdf_bytes, str):
+            st.error(pdf_bytes)
             st.stop()
 
-        # Display results
-        st.subheader("🧾 Stock Summary")
-        st.write(f"📌  {ticker_input} current price: ${stock_data['price']:.2f} ({stock_data['change']:+.2f}% today)."
-                 f" Over the past week, the stock has {'gained' if stock_data['week_change'] > 0 else 'lost'} {abs(stock_data['week_change']):.2f}%")
-
-        st.markdown("<h3 style='font-size: 24px;'>📈 Trend Analysis</h3>", unsafe_allow_html=True)
-        st.write(trend_analysis)
-
-        st.markdown("<h3 style='font-size: 24px;'>😊 Sentiment Analysis</h3>", unsafe_allow_html=True)
-        st.write(sentiment_result)
-
-        if image_analysis:
-            st.markdown("<h3 style='font-size: 24px;'>📊 Chart Analysis:</h3>", unsafe_allow_html=True)
-            st.write(image_analysis)
-
         # Provide downloadable report
         try:
-            with open(report_file, "rb") as file:
-                st.download_button(
-                    label="Download Analysis Report (PDF)",
-                    data=file,
-                    file_name=f"{ticker_input}_analysis_report.pdf",
-                    mime="application/pdf"
-                )
+            st.download_button(
+                label="Download Analysis Report (PDF)",
+                data=pdf_bytes,
+                file_name=f"{ticker_input}_analysis_report.pdf",
+                mime="application/pdf"
+            )
         except Exception as e:
             st.error(f"Error providing report download: {e}")
 
@@ -0,0 +1,110 @@
+import functools
+import hashlib
+import json
+import math
+import os
+import tempfile
+import time
+
+CACHE_DIR = os.getenv("SMARTSTOCK_CACHE_DIR", ".cache")
+
+# Last prune time per cache directory; module-level so it survives Streamlit reruns of app.py
+_last_prune = {}
+
+
+class FileCache:
+    """JSON file cache storing one entry per key under .cache/<namespace>/<md5(key)>.json."""
+
+    def __init__(self, namespace, ttl, root=CACHE_DIR):
+        self.directory = os.path.join(root, namespace)
+        self.ttl = ttl
+
+    def _path(self, key):
+        digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _prune(self):
+        """Delete expired entries and stale temp files, at most once per ttl.
+
+        Most keys (e.g. prompts built from the day's headlines) are never read again, so
+        expiring entries on read alone would let the directory grow without bound.
+        """
+        now = time.time()
+        if now - _last_prune.get(self.directory, 0.0) < self.ttl:
+            return
+        _last_prune[self.directory] = now
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    try:
+                        if now - entry.stat().st_mtime > self.ttl:
+                            self._remove(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+
+    def get(self, key):
+        """Return (hit, value) for a key, treating expired or unreadable entries as misses."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return False, None
+        if not isinstance(entry, dict) or "value" not in entry:
+            return False, None
+        ts = entry.get("ts")
+        if not isinstance(ts, (int, float)) or not math.isfinite(ts):
+            return False, None
+        if time.time() - ts > self.ttl:
+            self._remove(path)
+            return False, None
+        return True, entry["value"]
+
+    def set(self, key, value):
+        """Store a value for a key and prune expired entries; write failures never break a request."""
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"ts": time.time(), "value": value}, file)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError):
+            if tmp_path:
+                self._remove(tmp_path)
+        self._prune()
+
+
+def cached(ttl, key=None, cache_if=None):
+    """Cache a function's JSON-serializable result on disk for ttl seconds.
+
+    key maps the call arguments to the parts identifying an entry (defaults to the arguments
+    themselves); cache_if decides whether a result is worth storing, e.g. to skip errors.
+    """
+    def decorator(func):
+        file_cache = FileCache(func.__name__, ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parts = key(*args, **kwargs) if key else [args, kwargs]
+            cache_key = json.dumps([func.__name__, parts], sort_keys=True, default=str)
+            hit, value = file_cache.get(cache_key)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            if cache_if is None or cache_if(value):
+                file_cache.set(cache_key, value)
+            return value
+
+        return wrapper
+
+    return decorator